@@ -1,30 +1,68 @@
+import argparse
 import sqlite3
 import json
-
-conn = sqlite3.connect("games.db")
+from pathlib import Path
+
+import db
+from confidence import beta_intervals
+from irt import fit_irt, load_outcome_matrix, summarize_fit
+from wordle import MAX_GUESSES
+
+parser = argparse.ArgumentParser(description="Export leaderboard data for one run.")
+parser.add_argument(
+    "--run", metavar="NAME", help="Run to analyze (default: latest run)"
+)
+parser.add_argument(
+    "--irt",
+    choices=["rasch", "2pl"],
+    default="rasch",
+    help="Item-response model for word difficulty and model ability",
+)
+args = parser.parse_args()
+
+# Analyze the games.db in the working directory, upgrading older files first
+db.DB_PATH = Path("games.db")
+db.init_db()
+
+run = db.get_run(args.run) if args.run else db.get_latest_run()
+if run is None:
+    raise SystemExit(f"No run found{f' named {args.run!r}' if args.run else ''}")
+run_id = run["id"]
+print(f"Analyzing run '{run['name']}'")
+
+conn = sqlite3.connect(db.DB_PATH)
 cursor = conn.cursor()
 
 query = """
 SELECT
     model,
-    COUNT(CASE WHEN solved = TRUE AND guesses < 6 THEN 1 END) as successful_games,
-    AVG(CASE WHEN solved = TRUE AND guesses < 6 THEN guesses END) as guesses_per_game_avg,
-    AVG(cost) as avg_cost_per_game
+    COUNT(CASE WHEN solved = TRUE AND guesses < :max_guesses THEN 1 END) as successful_games,
+    AVG(CASE WHEN solved = TRUE AND guesses < :max_guesses THEN guesses END) as guesses_per_game_avg,
+    AVG(cost) as avg_cost_per_game,
+    COUNT(*) as games_played
 FROM games
+WHERE run_id = :run_id
 GROUP BY model
 ORDER BY 2 DESC
 """
 
-cursor.execute(query)
+cursor.execute(query, {"max_guesses": MAX_GUESSES, "run_id": run_id})
 result = cursor.fetchall()
 
+# 95% success-rate intervals for every model in one vectorized pass
+ci_low, ci_high = beta_intervals([row[1] for row in result], [row[4] for row in result])
+
 # Convert to list of dictionaries
 data = []
-for row in result:
+for row, low, high in zip(result, ci_low, ci_high):
     data.append(
         {
             "model": row[0],
             "successful_games": row[1],
+            "games_played": row[4],
+            "success_rate": round(100 * row[1] / row[4], 1),
+            "success_rate_ci_low": round(100 * float(low), 1),
+            "success_rate_ci_high": round(100 * float(high), 1),
             "guesses_per_game_avg": round(row[2], 2) if row[2] is not None else None,
             "avg_cost_per_game": round(row[3], 2) if row[3] is not None else None,
         }
@@ -42,12 +80,13 @@ SELECT
     word,
     COUNT(CASE WHEN solved = 0 THEN 1 END) as failure_count
 FROM games
+WHERE run_id = ?
 GROUP BY word
 ORDER BY failure_count DESC
 LIMIT 10
 """
 
-cursor.execute(query2)
+cursor.execute(query2, (run_id,))
 result2 = cursor.fetchall()
 
 # Convert to list of dictionaries
@@ -61,12 +100,28 @@ with open("failed_words.json", "w") as f:
 
 print(f"Wrote {len(hardest_words)} records to failed_words.json")
 
+# Calibrated word difficulty and model ability from the models x words matrix
+outcomes = load_outcome_matrix(conn, run_id)
+irt_fit = fit_irt(outcomes["solved"], model=args.irt)
+irt_data = summarize_fit(outcomes, irt_fit, args.irt)
+irt_data["run"] = run["name"]
+
+# Write to JSON file
+with open("irt.json", "w") as f:
+    json.dump(irt_data, f, indent=2)
+
+print(
+    f"Wrote {len(irt_data['models'])} model abilities and "
+    f"{len(irt_data['words'])} word difficulties to irt.json "
+    f"({args.irt}, {irt_fit['iterations']} iterations)"
+)
+
 # Query for top error models
 query3 = """
-SELECT model FROM games where error = true group by 1 order by  COUNT(CASE WHEN error = true THEN 1 END) desc limit 10;
+SELECT model FROM games where run_id = ? and error = true group by 1 order by  COUNT(CASE WHEN error = true THEN 1 END) desc limit 10;
 """
 
-cursor.execute(query3)
+cursor.execute(query3, (run_id,))
 result3 = cursor.fetchall()
 
 # Convert to list of dictionaries
@@ -81,3 +136,4 @@ with open("top_error_models.json", "w") as f:
 print(f"Wrote {len(top_error_models)} records to top_error_models.json")
 
 conn.close()
+db.close_connection()
@@ -0,0 +1,311 @@
+"""Wave-synchronous batch execution using provider batch endpoints.
+
+All of a model's games advance in lockstep: every active game's turn-k request
+is submitted as one batch job, the job is polled until it finishes, replies are
+scored locally with evaluate_guess, and the survivors' turn k+1 is submitted.
+Every model has its own job in flight at the same time.
+
+An endpoint is any object with:
+    supports(model) -> bool
+    submit(requests) -> batch_id, where each request is a dict with
+        "custom_id", "model" and "messages"
+    status(batch_id) -> "pending", "completed" or "failed"
+    results(batch_id) -> {custom_id: {"content": str | None, "cost": float | None}}
+        for the requests that succeeded; a "failed" job may still have some
+"""
+
+import io
+import itertools
+import json
+import re
+import time
+import traceback
+from collections.abc import Callable
+
+from db import add_game
+from wordle import build_request_messages, evaluate_guess, new_game, record_reply
+
+
+class OpenAIBatchEndpoint:
+    """OpenAI-compatible /v1/batches endpoint for chat completions.
+
+    Only models in `models` are accepted. Batch output has no cost field, so
+    replies carry a cost of None.
+    """
+
+    def __init__(
+        self,
+        client,
+        models: set[str],
+        completion_window: str = "24h",
+        extra_body: dict | None = None,
+    ):
+        self.client = client
+        self.models = set(models)
+        self.completion_window = completion_window
+        self.extra_body = (
+            extra_body if extra_body is not None else {"reasoning_effort": "high"}
+        )
+
+    def supports(self, model: str) -> bool:
+        return model in self.models
+
+    def submit(self, requests: list[dict]) -> str:
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": request["custom_id"],
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        # Native batch APIs take the bare model name, not
+                        # "provider/model"
+                        "model": request["model"].split("/", 1)[-1],
+                        "messages": request["messages"],
+                        **self.extra_body,
+                    },
+                }
+            )
+            for request in requests
+        ]
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", io.BytesIO("\n".join(lines).encode())),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            return "completed"
+        if batch.status in ("failed", "expired", "cancelled"):
+            return "failed"
+        return "pending"
+
+    def results(self, batch_id: str) -> dict[str, dict]:
+        batch = self.client.batches.retrieve(batch_id)
+        replies = {}
+        if batch.output_file_id is None:
+            return replies
+
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                print(
+                    f"Batch {batch_id} request {item['custom_id']} failed: "
+                    f"{item.get('error')}"
+                )
+                continue
+            body = response["body"]
+            replies[item["custom_id"]] = {
+                "content": body["choices"][0]["message"]["content"],
+                "cost": None,
+            }
+        return replies
+
+
+class LocalBatchEndpoint:
+    """In-process stand-in for a batch endpoint, for offline runs and testing.
+
+    Each request is answered by `responder(model, messages)`. A job reports
+    "pending" for `polls_until_complete` status checks before completing.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str, list[dict]], str],
+        polls_until_complete: int = 1,
+    ):
+        self.responder = responder
+        self.polls_until_complete = polls_until_complete
+        self._jobs: dict[str, dict] = {}
+        self._ids = itertools.count(1)
+
+    def supports(self, model: str) -> bool:
+        return True
+
+    def submit(self, requests: list[dict]) -> str:
+        batch_id = f"local-batch-{next(self._ids)}"
+        self._jobs[batch_id] = {
+            "requests": [
+                {**request, "messages": list(request["messages"])}
+                for request in requests
+            ],
+            "polls": 0,
+        }
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        job = self._jobs[batch_id]
+        job["polls"] += 1
+        if job["polls"] > self.polls_until_complete:
+            return "completed"
+        return "pending"
+
+    def results(self, batch_id: str) -> dict[str, dict]:
+        job = self._jobs.pop(batch_id)
+        return {
+            request["custom_id"]: {
+                "content": self.responder(request["model"], request["messages"]),
+                "cost": 0.0,
+            }
+            for request in job["requests"]
+        }
+
+
+def solver_responder(words: list[str]) -> Callable[[str, list[dict]], str]:
+    """Build a responder that guesses the first word consistent with all feedback.
+
+    Understands both the full transcript and the compact history format.
+    """
+    candidates = [word.upper() for word in words]
+    compact_pattern = re.compile(r"^\d+\. ([A-Z]{5}) -> ([GYB]{5})$", re.MULTILINE)
+
+    def respond(model: str, messages: list[dict]) -> str:
+        feedback = []
+        last_guess = None
+        for message in messages:
+            content = message.get("content") or ""
+            if message["role"] == "assistant":
+                match = re.search(r"<guess>(.*?)</guess>", content, re.DOTALL)
+                last_guess = match.group(1).strip().upper() if match else None
+            elif content.startswith("Result: ") and last_guess:
+                feedback.append((last_guess, content.removeprefix("Result: ").strip()))
+            else:
+                feedback.extend(compact_pattern.findall(content))
+
+        for candidate in candidates:
+            if all(evaluate_guess(g, candidate) == r for g, r in feedback):
+                guess = candidate
+                break
+        else:
+            guess = candidates[0]
+        analysis = f"<analysis>{len(feedback)} prior guesses</analysis>"
+        return f"{analysis}\n<guess>{guess}</guess>"
+
+    return respond
+
+
+def run_batch(
+    words_by_model: dict[str, list[str]],
+    run: dict,
+    endpoint,
+    history_mode: str = "full",
+    poll_interval: float = 30.0,
+    max_retries: int = 2,
+) -> int:
+    """Play every model's words in lockstep and persist each finished game.
+
+    Each model advances independently: as soon as its turn-k job finishes, its
+    surviving games' turn k+1 is submitted. A request the provider failed is
+    resubmitted with the next wave up to `max_retries` times; after that the
+    game is left unsaved so resuming the run replays it. An exception while
+    handling one model's job only drops that model.
+
+    Returns the number of games played.
+    """
+    # model -> {word: (game, history, failed attempts at the current turn)}
+    active = {
+        model: {
+            word: (new_game(word, model, run, history_mode), [], 0) for word in words
+        }
+        for model, words in words_by_model.items()
+        if words
+    }
+    jobs: dict[str, str] = {}
+    turns = dict.fromkeys(active, 1)
+    played = 0
+
+    def submit(model: str) -> None:
+        requests = [
+            {
+                "custom_id": word,
+                "model": model,
+                "messages": build_request_messages(game, history),
+            }
+            for word, (game, history, _) in active[model].items()
+        ]
+        batch_id = endpoint.submit(requests)
+        jobs[batch_id] = model
+        print(
+            f"({model}) Turn {turns[model]}: submitted batch {batch_id} "
+            f"with {len(requests)} games"
+        )
+
+    def collect(model: str, batch_id: str) -> int:
+        """Apply a finished job's replies and return the number of games saved."""
+        saved = 0
+        replies = endpoint.results(batch_id)
+        games = active[model]
+        for word in list(games):
+            game, history, failures = games[word]
+            reply = replies.get(word)
+            if reply is None:
+                if failures < max_retries:
+                    games[word] = (game, history, failures + 1)
+                else:
+                    print(
+                        f"({model} {word}) Provider kept failing; "
+                        "left unsaved for a resume"
+                    )
+                    del games[word]
+                continue
+
+            if reply["cost"] is None or game.cost is None:
+                game.cost = None
+            else:
+                game.cost += reply["cost"]
+            games[word] = (game, history, 0)
+            if record_reply(game, history, reply["content"]):
+                add_game(game)
+                del games[word]
+                saved += 1
+        turns[model] += 1
+        return saved
+
+    for model in list(active):
+        try:
+            submit(model)
+        except Exception as exc:
+            print(f"({model}) Batch submission failed, skipping model: {exc}")
+            traceback.print_exc()
+            del active[model]
+
+    while jobs:
+        finished = False
+        for batch_id, model in list(jobs.items()):
+            try:
+                status = endpoint.status(batch_id)
+                if status == "pending":
+                    continue
+                finished = True
+                del jobs[batch_id]
+                if status == "failed":
+                    print(
+                        f"({model}) Batch {batch_id} failed; keeping any partial output"
+                    )
+                played += collect(model, batch_id)
+                if active[model]:
+                    submit(model)
+            except Exception as exc:
+                print(
+                    f"({model}) Batch {batch_id} raised an exception, "
+                    f"skipping model: {exc}"
+                )
+                traceback.print_exc()
+                jobs.pop(batch_id, None)
+                del active[model]
+
+        if jobs and not finished:
+            time.sleep(poll_interval)
+
+    return played
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Benchmark the harness machinery and save the results as JSON.
+
+Covers guess scoring and tag parsing throughput, concurrent add_game inserts,
+viewer query and transcript search latency, transcript search on a 1m-game
+database, and the analyze.py / generate_table.py pipeline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+sys.path.insert(0, str(ROOT))
+
+import db  # noqa: E402
+from benchmarks.synth_db import (  # noqa: E402
+    generate_db,
+    generate_rows,
+    load_words,
+    make_model_names,
+    make_reply_pool,
+)
+from models import Game  # noqa: E402
+from wordle import evaluate_guess, extract_tag  # noqa: E402
+
+
+def summarize(samples: list[float]) -> dict:
+    """Summarize per-call timings given in seconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "calls": len(samples),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+    }
+
+
+def time_calls(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+@contextmanager
+def use_db(path: Path):
+    """Point db.py at another database file for the duration of the block."""
+    original_path = db.DB_PATH
+    db.close_connection()
+    db.DB_PATH = path
+    try:
+        yield
+    finally:
+        db.close_connection()
+        db.DB_PATH = original_path
+
+
+def bench_evaluate_guess(words: list[str], calls: int) -> dict:
+    rng = random.Random(0)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(calls)]
+    start = time.perf_counter()
+    for guess, target in pairs:
+        evaluate_guess(guess, target)
+    elapsed = time.perf_counter() - start
+    return {"calls": calls, "calls_per_sec": round(calls / elapsed)}
+
+
+def bench_extract_tag(replies: list[str], calls: int) -> dict:
+    start = time.perf_counter()
+    for i in range(calls):
+        extract_tag(replies[i % len(replies)], "guess")
+    elapsed = time.perf_counter() - start
+    return {"calls": calls, "calls_per_sec": round(calls / elapsed)}
+
+
+def bench_add_game(tmpdir: Path, thread_counts: list[int], games: int) -> dict:
+    """Insert `games` realistic games into a fresh database from N threads."""
+    words = load_words()
+    replies = make_reply_pool(random.Random(0), words, 64, 1500)
+    system_prompt = (ROOT / "prompts/system_prompt.md").read_text()
+    user_prompt = (ROOT / "prompts/user_prompt.md").read_text()
+    rows = list(
+        generate_rows(
+            games, make_model_names(85), words, replies, system_prompt, user_prompt, 0
+        )
+    )
+    prepared = [
+        Game(
+            model=row[0],
+            word=row[1],
+            guesses=row[2],
+            solved=row[3],
+            error=row[4],
+            messages=json.loads(row[5]),
+            cost=row[6],
+        )
+        for row in rows
+    ]
+
+    results = {}
+    for threads in thread_counts:
+        path = tmpdir / f"insert_{threads}.db"
+        with use_db(path):
+            db.init_db()
+            run_id = db.create_run("insert")
+            for game in prepared:
+                game.run_id = run_id
+            chunks = [prepared[i::threads] for i in range(threads)]
+
+            def insert(chunk):
+                for game in chunk:
+                    db.add_game(game)
+                db.close_connection()
+
+            workers = [threading.Thread(target=insert, args=(c,)) for c in chunks]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+
+        results[f"threads_{threads}"] = {
+            "games": games,
+            "games_per_sec": round(games / elapsed),
+        }
+    return results
+
+
+def bench_queries(db_path: Path, repeat: int) -> dict:
+    """Latency of the viewer's database calls against an existing database."""
+    with use_db(db_path):
+        # Bring older files up to the current schema, as the viewer does on start
+        db.init_db()
+        conn = db._get_connection()
+        max_id = conn.execute("SELECT MAX(id) FROM games").fetchone()[0] or 1
+        options = db.get_filter_options()
+        model = options["models"][0] if options["models"] else None
+        word = options["words"][0] if options["words"] else None
+        last_page = max(1, max_id // 100)
+
+        run_id = db.get_latest_run()["id"]
+
+        rng = random.Random(0)
+        cases = {
+            "list_games_first_page": lambda: db.list_games(),
+            "list_games_last_page": lambda: db.list_games(page=last_page),
+            "list_games_sort_cost_desc": lambda: db.list_games(
+                sort_by="cost", sort_order="desc"
+            ),
+            "list_games_filter_model": lambda: db.list_games(model=model),
+            "list_games_filter_run_model": lambda: db.list_games(
+                run_id=run_id, model=model
+            ),
+            "check_game": lambda: db.check_game(model, word, run_id),
+            "list_games_filter_word_solved": lambda: db.list_games(
+                word=word, solved=True
+            ),
+            "get_filter_options": db.get_filter_options,
+            "get_game": lambda: db.get_game(rng.randint(1, max_id)),
+            **search_cases(model),
+        }
+        return {name: summarize(time_calls(fn, repeat)) for name, fn in cases.items()}
+
+
+def search_cases(model: str | None) -> dict:
+    return {
+        "search_messages_common": lambda: db.search_messages("duplicate"),
+        "search_messages_phrase": lambda: db.search_messages('"split them evenly"'),
+        "search_messages_rare": lambda: db.search_messages("zzzyzzy"),
+        "search_messages_common_model": lambda: db.search_messages(
+            "duplicate", model=model
+        ),
+        "search_messages_common_page_50": lambda: db.search_messages(
+            "duplicate", page=50
+        ),
+    }
+
+
+def bench_search_scale(db_path: Path, repeat: int) -> dict:
+    """Transcript search latency on a large database."""
+    with use_db(db_path):
+        db.init_db()
+        model = db.get_filter_options()["models"][0]
+        cases = search_cases(model)
+        return {name: summarize(time_calls(fn, repeat)) for name, fn in cases.items()}
+
+
+def bench_scripts(db_path: Path, tmpdir: Path, repeat: int) -> dict:
+    """Wall time of analyze.py then generate_table.py in a scratch directory."""
+    workdir = tmpdir / "site_build"
+    workdir.mkdir()
+    shutil.copytree(ROOT / "site", workdir / "site")
+    (workdir / "games.db").symlink_to(db_path.resolve())
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+
+    results = {}
+    for script in ("analyze.py", "generate_table.py"):
+        samples = time_calls(
+            lambda: subprocess.run(
+                [sys.executable, str(ROOT / script)],
+                cwd=workdir,
+                env=env,
+                check=True,
+                capture_output=True,
+            ),
+            repeat,
+        )
+        results[script.removesuffix(".py")] = summarize(samples)
+    return results
+
+
+def describe_db(db_path: Path) -> dict:
+    conn = sqlite3.connect(db_path)
+    try:
+        games = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+    finally:
+        conn.close()
+    return {"path": str(db_path), "games": games, "bytes": db_path.stat().st_size}
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def compare(previous: dict, current: dict) -> None:
+    """Print how each shared metric moved between two result files."""
+    print(f"Comparing {previous.get('commit')} -> {current.get('commit')}")
+
+    def walk(old, new, prefix):
+        for key, value in new.items():
+            if key not in old:
+                continue
+            name = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                walk(old[key], value, name)
+            elif key.endswith(("_ms", "_per_sec")) and old[key]:
+                ratio = value / old[key]
+                print(f"  {name}: {old[key]} -> {value} ({ratio:.2f}x)")
+
+    walk(previous["benchmarks"], current["benchmarks"], "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help="Database for query and script benchmarks (default: synthetic 10k)",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per query")
+    parser.add_argument(
+        "--script-repeat", type=int, default=3, help="Runs per script benchmark"
+    )
+    parser.add_argument(
+        "--micro-calls", type=int, default=200_000, help="Calls per micro benchmark"
+    )
+    parser.add_argument(
+        "--insert-games", type=int, default=2_000, help="Games per insert benchmark"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 8, 25],
+        help="Thread counts for the insert benchmark",
+    )
+    parser.add_argument(
+        "--search-db",
+        type=Path,
+        default=None,
+        help="Large database for the search benchmark "
+        "(default: synthetic, see --search-games)",
+    )
+    parser.add_argument(
+        "--search-games",
+        type=int,
+        default=1_000_000,
+        help="Games in the generated search database; 0 skips the benchmark",
+    )
+    parser.add_argument("--out", type=Path, default=None, help="Results JSON path")
+    parser.add_argument(
+        "--compare", type=Path, default=None, help="Previous results JSON to diff"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        db_path = args.db
+        if db_path is None:
+            db_path = tmpdir / "synthetic.db"
+            print("Generating synthetic 10k database...")
+            generate_db(db_path, 10_000)
+
+        words = load_words()
+        replies = make_reply_pool(random.Random(0), words, 512, 1500)
+
+        benchmarks = {}
+        print("Running micro benchmarks...")
+        benchmarks["evaluate_guess"] = bench_evaluate_guess(words, args.micro_calls)
+        benchmarks["extract_tag"] = bench_extract_tag(replies, args.micro_calls)
+        print("Running insert benchmarks...")
+        benchmarks["add_game"] = bench_add_game(tmpdir, args.threads, args.insert_games)
+        print("Running query benchmarks...")
+        benchmarks["queries"] = bench_queries(db_path, args.repeat)
+        print("Running script benchmarks...")
+        benchmarks["scripts"] = bench_scripts(db_path, tmpdir, args.script_repeat)
+
+        search_db = args.search_db
+        if search_db is None and args.search_games:
+            search_db = tmpdir / "search.db"
+            print(f"Generating synthetic {args.search_games:,}-game search database...")
+            generate_db(search_db, args.search_games)
+        if search_db is not None:
+            print("Running search scale benchmarks...")
+            benchmarks["search_scale"] = {
+                "db": describe_db(search_db),
+                **bench_search_scale(search_db, args.repeat),
+            }
+
+        result = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db": describe_db(db_path),
+            "benchmarks": benchmarks,
+        }
+
+    out = args.out
+    if out is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        out = RESULTS_DIR / f"{stamp}.json"
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(json.dumps(benchmarks, indent=2))
+    print(f"✓ Wrote benchmark results to {out}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Generate a synthetic games.db with realistic transcripts for benchmarking."""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import db  # noqa: E402
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+PROVIDERS = ["openai", "anthropic", "google", "qwen", "z-ai", "x-ai", "deepseek"]
+
+FILLER = (
+    "Greens are locked by position, yellows must move, and grays are excluded "
+    "unless a duplicate is confirmed elsewhere. Remaining candidates include "
+    "several common words, so the next guess should split them evenly. "
+)
+
+
+def load_words() -> list[str]:
+    with open(ROOT / "words_full.txt", "r") as file:
+        return [line.strip().upper() for line in file if line.strip()]
+
+
+def make_model_names(count: int) -> list[str]:
+    return [f"{PROVIDERS[i % len(PROVIDERS)]}/synthetic-{i:03d}" for i in range(count)]
+
+
+def make_reply_pool(rng: random.Random, words: list[str], size: int, mean_chars: int):
+    """Pre-build assistant replies so generation is bound by SQLite, not text."""
+    pool = []
+    for _ in range(size):
+        length = max(200, int(rng.gauss(mean_chars, mean_chars / 3)))
+        analysis = (FILLER * (length // len(FILLER) + 1))[:length]
+        guess = rng.choice(words)
+        pool.append(f"<analysis>\n{analysis}\n</analysis>\n<guess>{guess}</guess>")
+    return pool
+
+
+def make_feedback(rng: random.Random) -> str:
+    return "".join(rng.choice("GYB") for _ in range(5))
+
+
+def generate_rows(
+    count, models, words, replies, system_prompt, user_prompt, seed, run_id=None
+):
+    """Yield rows matching the games table column order used by insert_rows."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        model = rng.choice(models)
+        word = rng.choice(words)
+        turns = rng.randint(1, 6)
+        solved = rng.random() < 0.7
+        error = not solved and rng.random() < 0.05
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        for turn in range(turns):
+            messages.append({"role": "assistant", "content": rng.choice(replies)})
+            if turn < turns - 1:
+                messages.append(
+                    {"role": "user", "content": f"Result: {make_feedback(rng)}"}
+                )
+
+        yield (
+            model,
+            word,
+            -1 if error else (turns if solved else 6),
+            solved,
+            error,
+            json.dumps(messages),
+            round(rng.uniform(0.001, 0.5), 4),
+            run_id,
+        )
+
+
+INSERT_SQL = """
+    INSERT INTO games (model, word, guesses, solved, error, messages, cost, run_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def insert_rows(path: Path, rows, batch_size: int = 10_000) -> int:
+    """Bulk insert rows with durability relaxed; returns the number inserted."""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA cache_size = -256000")
+
+        inserted = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.executemany(INSERT_SQL, batch)
+                conn.commit()
+                inserted += len(batch)
+                batch.clear()
+                print(f"  {inserted:,} games", end="\r", flush=True)
+        if batch:
+            conn.executemany(INSERT_SQL, batch)
+            conn.commit()
+            inserted += len(batch)
+        print()
+
+        conn.execute("ANALYZE")
+        return inserted
+    finally:
+        conn.close()
+
+
+def generate_db(
+    path: Path,
+    games: int,
+    models: int = 85,
+    words: int | None = None,
+    reply_chars: int = 1500,
+    seed: int = 0,
+) -> int:
+    """Create a fresh synthetic database at `path` with the given number of games."""
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+
+    all_words = load_words()
+    rng = random.Random(seed)
+    word_list = (
+        rng.sample(all_words, min(words, len(all_words))) if words else all_words
+    )
+    model_list = make_model_names(models)
+    replies = make_reply_pool(rng, word_list, 512, reply_chars)
+    system_prompt = (ROOT / "prompts/system_prompt.md").read_text()
+    user_prompt = (ROOT / "prompts/user_prompt.md").read_text()
+
+    # Let db.py own the schema and search index so synthetic files match production
+    original_path = db.DB_PATH
+    db.DB_PATH = path
+    try:
+        db.init_db()
+        run_id = db.create_run("synthetic")
+        rows = generate_rows(
+            games,
+            model_list,
+            word_list,
+            replies,
+            system_prompt,
+            user_prompt,
+            seed,
+            run_id,
+        )
+        inserted = insert_rows(path, rows)
+        db.rebuild_search_index()
+        db.close_connection()
+    finally:
+        db.DB_PATH = original_path
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("out", type=Path, help="Path of the database to create")
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument("--size", choices=sorted(SIZES), help="Preset number of games")
+    size.add_argument("--games", type=int, help="Exact number of games")
+    parser.add_argument("--models", type=int, default=85, help="Distinct models")
+    parser.add_argument(
+        "--words", type=int, default=None, help="Distinct words (default: all)"
+    )
+    parser.add_argument(
+        "--reply-chars",
+        type=int,
+        default=1500,
+        help="Mean assistant reply length in characters",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    games = SIZES[args.size] if args.size else args.games
+    start = time.perf_counter()
+    inserted = generate_db(
+        args.out, games, args.models, args.words, args.reply_chars, args.seed
+    )
+    elapsed = time.perf_counter() - start
+    size_mb = args.out.stat().st_size / 1e6
+    print(
+        f"✓ Wrote {inserted:,} games to {args.out} "
+        f"({size_mb:,.0f} MB) in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Per-model confidence intervals and the adaptive early-stopping scheduler."""
+
+import threading
+
+import numpy as np
+
+from models import Game
+from wordle import MAX_GUESSES
+
+
+def is_success(game: Game) -> bool:
+    """Return True if a game counts as a success on the leaderboard."""
+    return game.solved and game.guesses < MAX_GUESSES
+
+
+def beta_intervals(
+    successes,
+    trials,
+    level: float = 0.95,
+    samples: int = 4000,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Equal-tailed Beta(1 + s, 1 + f) posterior intervals for each success rate.
+
+    All models are sampled in one vectorized draw of shape (models, samples).
+    Returns a tuple of (low, high) arrays of rates in [0, 1].
+    """
+    successes = np.asarray(successes, dtype=float)
+    trials = np.asarray(trials, dtype=float)
+    if successes.size == 0:
+        return np.zeros(0), np.zeros(0)
+
+    rng = np.random.default_rng(seed)
+    draws = rng.beta(
+        1.0 + successes[:, None],
+        1.0 + (trials - successes)[:, None],
+        size=(successes.size, samples),
+    )
+    tail = (1.0 - level) / 2.0
+    low, high = np.quantile(draws, [tail, 1.0 - tail], axis=1)
+    return low, high
+
+
+class AdaptiveScheduler:
+    """Track per-model intervals and decide when a model has played enough games.
+
+    A model is stopped once it has played at least `min_games` and either its
+    interval no longer overlaps the models ranked directly above and below it,
+    or the interval is narrower than `precision`. Stopped models stay stopped.
+    """
+
+    def __init__(
+        self,
+        models: list[str],
+        level: float = 0.95,
+        precision: float = 0.1,
+        min_games: int = 20,
+    ):
+        self.models = list(models)
+        self.level = level
+        self.precision = precision
+        self.min_games = min_games
+
+        self._index = {model: i for i, model in enumerate(self.models)}
+        self.successes = np.zeros(len(self.models))
+        self.trials = np.zeros(len(self.models))
+        self.low = np.zeros(len(self.models))
+        self.high = np.ones(len(self.models))
+        self._stopped = np.zeros(len(self.models), dtype=bool)
+        self._lock = threading.Lock()
+
+    def seed(self, outcomes: dict[str, tuple[int, int]]) -> list[str]:
+        """Load existing (successes, games) counts and return any models stopped by them."""
+        with self._lock:
+            for model, (successes, games) in outcomes.items():
+                i = self._index.get(model)
+                if i is not None:
+                    self.successes[i] = successes
+                    self.trials[i] = games
+            return self._update()
+
+    def record(self, game: Game) -> list[str]:
+        """Record a finished game and return the models that became stopped."""
+        with self._lock:
+            i = self._index.get(game.model)
+            if i is None:
+                return []
+            self.trials[i] += 1
+            self.successes[i] += is_success(game)
+            return self._update()
+
+    def is_stopped(self, model: str) -> bool:
+        """Return True if no further games should be dispatched for the model."""
+        i = self._index.get(model)
+        return i is not None and bool(self._stopped[i])
+
+    def interval(self, model: str) -> tuple[float, float]:
+        """Return the current (low, high) success-rate interval for the model."""
+        i = self._index[model]
+        return float(self.low[i]), float(self.high[i])
+
+    def _update(self) -> list[str]:
+        """Recompute all intervals and stopping decisions. Caller holds the lock."""
+        n = len(self.models)
+        if n == 0:
+            return []
+
+        self.low, self.high = beta_intervals(self.successes, self.trials, self.level)
+
+        # Rank by posterior mean and compare each model with its neighbours.
+        mean = (self.successes + 1.0) / (self.trials + 2.0)
+        order = np.argsort(-mean, kind="stable")
+        low = self.low[order]
+        high = self.high[order]
+
+        clear_above = np.ones(n, dtype=bool)
+        clear_below = np.ones(n, dtype=bool)
+        clear_above[1:] = high[1:] < low[:-1]
+        clear_below[:-1] = low[:-1] > high[1:]
+
+        # A lone model has no leaderboard position to settle, only precision.
+        separated = np.zeros(n, dtype=bool)
+        if n > 1:
+            separated[order] = clear_above & clear_below
+        precise = (self.high - self.low) <= self.precision
+
+        stop = (self.trials >= self.min_games) & (separated | precise)
+        newly = stop & ~self._stopped
+        self._stopped |= stop
+        return [self.models[i] for i in np.flatnonzero(newly)]
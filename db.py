@@ -4,11 +4,31 @@ import threading
 from pathlib import Path
 
 from models import Game
+from wordle import MAX_GUESSES
 
 DB_PATH = Path(__file__).parent / "games.db"
+# Games recorded before runs existed were all tagged with this trace run name
+LEGACY_RUN_NAME = "2026-03-18"
 _db_lock = threading.Lock()
 _thread_local = threading.local()
 
+# Control characters wrapped around matched terms in search snippets; callers
+# escape the snippet text and then swap these for highlighting markup.
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+# OperationalError messages SQLite raises for MATCH queries that do not parse
+FTS5_QUERY_ERRORS = (
+    "fts5: syntax error",
+    "unterminated string",
+    "no such column",
+    "unknown special query",
+)
+# Searches count and rank at most this many matches, newest turns first
+SEARCH_MATCH_LIMIT = 1_000
+# BM25 parameters for ranking search matches
+BM25_K1 = 1.2
+BM25_B = 0.75
+
 
 def _configure_connection(conn: sqlite3.Connection) -> None:
     """Configure a per-connection SQLite pragmas."""
@@ -36,6 +56,15 @@ def init_db() -> None:
     try:
         _configure_connection(conn)
 
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                history_mode TEXT DEFAULT 'full',
+                execution_mode TEXT DEFAULT 'interactive'
+            )
+        """)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS games (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -45,28 +74,159 @@ def init_db() -> None:
                 solved BOOLEAN DEFAULT FALSE,
                 error BOOLEAN DEFAULT FALSE,
                 messages TEXT DEFAULT '[]',
-                cost REAL DEFAULT 0.0
+                cost REAL DEFAULT 0.0,
+                run_id INTEGER REFERENCES runs (id),
+                history_mode TEXT DEFAULT 'full'
             )
         """)
+        _migrate_legacy_games(conn)
         conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_games_model_word
             ON games (model, word)
         """)
+        # Per-run queries lead on run_id so they never touch other runs
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_games_run_model_word
+            ON games (run_id, model, word)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_games_run_word
+            ON games (run_id, word)
+        """)
+
+        # Build the full-text index when it is missing or predates the model
+        # column
+        fts_columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(messages_fts)")
+        }
+        if "model" not in fts_columns:
+            _rebuild_search_index(conn)
 
         conn.commit()
     finally:
         conn.close()
 
 
+def _migrate_legacy_games(conn: sqlite3.Connection) -> None:
+    """Add newer runs and games columns to older databases.
+
+    Games recorded before runs existed are assigned to the legacy run once,
+    when the run_id column is first added.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(games)")}
+    if "run_id" not in columns:
+        conn.execute("ALTER TABLE games ADD COLUMN run_id INTEGER REFERENCES runs (id)")
+        if conn.execute("SELECT 1 FROM games LIMIT 1").fetchone():
+            conn.execute(
+                "INSERT OR IGNORE INTO runs (name) VALUES (?)", (LEGACY_RUN_NAME,)
+            )
+            conn.execute(
+                "UPDATE games SET run_id = (SELECT id FROM runs WHERE name = ?)",
+                (LEGACY_RUN_NAME,),
+            )
+    if "history_mode" not in columns:
+        conn.execute("ALTER TABLE games ADD COLUMN history_mode TEXT DEFAULT 'full'")
+
+    run_columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+    if "history_mode" not in run_columns:
+        conn.execute("ALTER TABLE runs ADD COLUMN history_mode TEXT DEFAULT 'full'")
+        # Runs played entirely in compact mode keep that mode
+        conn.execute("""
+            UPDATE runs SET history_mode = 'compact'
+            WHERE id IN (
+                SELECT run_id FROM games
+                GROUP BY run_id
+                HAVING MIN(history_mode) = 'compact' AND MAX(history_mode) = 'compact'
+            )
+        """)
+    if "execution_mode" not in run_columns:
+        conn.execute(
+            "ALTER TABLE runs ADD COLUMN execution_mode TEXT DEFAULT 'interactive'"
+        )
+
+
+def _index_messages(conn: sqlite3.Connection, game_id: int, game: Game) -> None:
+    """Add a game's assistant replies to the full-text index."""
+    assistant = [
+        m.get("content") or "" for m in game.messages if m.get("role") == "assistant"
+    ]
+    conn.executemany(
+        "INSERT INTO messages_fts (content, game_id, turn, model) VALUES (?, ?, ?, ?)",
+        [
+            (content, game_id, turn, game.model)
+            for turn, content in enumerate(assistant, start=1)
+        ],
+    )
+
+
+def _rebuild_search_index(conn: sqlite3.Connection, batch_size: int = 10_000) -> None:
+    """Recreate the full-text index from the games table.
+
+    One row per assistant reply; the model is indexed too, so a model filter
+    is a posting-list intersection rather than a join with games. Dropping the
+    table is far cheaper than an FTS5 DELETE, and id-range batches keep the
+    turn numbering from sorting the whole table in memory.
+    """
+    conn.execute("DROP TABLE IF EXISTS messages_fts")
+    conn.execute("""
+        CREATE VIRTUAL TABLE messages_fts USING fts5(
+            content,
+            model,
+            game_id UNINDEXED,
+            turn UNINDEXED,
+            tokenize = 'porter unicode61'
+        )
+    """)
+    max_id = conn.execute("SELECT MAX(id) FROM games").fetchone()[0] or 0
+    for start in range(0, max_id, batch_size):
+        conn.execute(
+            """
+            INSERT INTO messages_fts (content, game_id, turn, model)
+            SELECT
+                json_extract(m.value, '$.content'),
+                g.id,
+                ROW_NUMBER() OVER (PARTITION BY g.id ORDER BY m.key),
+                g.model
+            FROM games g, json_each(g.messages) m
+            WHERE g.id > ? AND g.id <= ?
+              AND json_extract(m.value, '$.role') = 'assistant'
+            """,
+            (start, start + batch_size),
+        )
+    conn.execute("INSERT INTO messages_fts (messages_fts) VALUES ('optimize')")
+
+
+def rebuild_search_index() -> None:
+    """Rebuild the full-text index, e.g. after bulk-loading games outside add_game."""
+    with _db_lock:
+        conn = _get_connection()
+        try:
+            _rebuild_search_index(conn)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
 def add_game(game: Game) -> None:
-    """Insert a new game record into the database."""
+    """Insert a new game record into the database.
+
+    Raises ValueError if the game is not assigned to a run.
+    """
+    if game.run_id is None:
+        raise ValueError(
+            f"Game for model {game.model} and word {game.word} has no run_id"
+        )
+
     with _db_lock:
         conn = _get_connection()
         try:
-            conn.execute(
+            cursor = conn.execute(
                 """
-                INSERT INTO games (model, word, guesses, solved, error, messages, cost)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO games (
+                    model, word, guesses, solved, error, messages, cost, run_id, history_mode
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     game.model,
@@ -76,23 +236,26 @@ def add_game(game: Game) -> None:
                     game.error,
                     json.dumps(game.messages),
                     game.cost,
+                    game.run_id,
+                    game.history_mode,
                 ),
             )
+            _index_messages(conn, cursor.lastrowid, game)
             conn.commit()
         except BaseException:
             conn.rollback()
             raise
 
 
-def check_game(model: str, word: str) -> bool:
-    """Check if a game record with the given model and word already exists.
+def check_game(model: str, word: str, run_id: int) -> bool:
+    """Check if a game record with the given model and word already exists in a run.
 
     Safe to call without the write lock — WAL mode allows concurrent reads.
     """
     conn = _get_connection()
     cursor = conn.execute(
-        "SELECT 1 FROM games WHERE model = ? AND word = ? LIMIT 1",
-        (model, word),
+        "SELECT 1 FROM games WHERE run_id = ? AND model = ? AND word = ? LIMIT 1",
+        (run_id, model, word),
     )
     return cursor.fetchone() is not None
 
@@ -109,7 +272,10 @@ def get_game(game_id: int) -> Game | None:
     """Retrieve a game record by its ID."""
     conn = _get_connection()
     cursor = conn.execute(
-        "SELECT id, model, word, guesses, solved, error, messages, cost FROM games WHERE id = ?",
+        """
+        SELECT id, model, word, guesses, solved, error, messages, cost, run_id, history_mode
+        FROM games WHERE id = ?
+        """,
         (game_id,),
     )
     row = cursor.fetchone()
@@ -124,6 +290,8 @@ def get_game(game_id: int) -> Game | None:
         error=bool(row[5]),
         messages=json.loads(row[6]),
         cost=row[7],
+        run_id=row[8],
+        history_mode=row[9],
     )
 
 
@@ -136,6 +304,7 @@ def list_games(
     word: str | None = None,
     solved: bool | None = None,
     error: bool | None = None,
+    run_id: int | None = None,
 ) -> tuple[list[dict], int]:
     """List games with pagination, sorting, and filtering.
 
@@ -152,6 +321,9 @@ def list_games(
     # Build WHERE clause for filtering
     where_clauses = []
     params = []
+    if run_id is not None:
+        where_clauses.append("run_id = ?")
+        params.append(run_id)
     if model:
         where_clauses.append("model = ?")
         params.append(model)
@@ -211,4 +383,300 @@ def get_filter_options() -> dict:
     cursor = conn.execute("SELECT DISTINCT word FROM games ORDER BY word")
     words = [row[0] for row in cursor.fetchall()]
 
+    cursor = conn.execute("SELECT id, name FROM runs ORDER BY id DESC")
+    runs = [{"id": row[0], "name": row[1]} for row in cursor.fetchall()]
+
+    return {"models": models, "words": words, "runs": runs}
+
+
+def get_model_outcomes(run_id: int) -> dict[str, tuple[int, int]]:
+    """Get per-model (successful_games, games_played) counts for a run.
+
+    Success follows the leaderboard rule in analyze.py: solved in fewer than
+    MAX_GUESSES guesses.
+    """
+    conn = _get_connection()
+    cursor = conn.execute(
+        """
+        SELECT
+            model,
+            COUNT(CASE WHEN solved = TRUE AND guesses < ? THEN 1 END),
+            COUNT(*)
+        FROM games
+        WHERE run_id = ?
+        GROUP BY model
+        """,
+        (MAX_GUESSES, run_id),
+    )
+    return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+
+def search_messages(
+    query: str,
+    page: int = 1,
+    per_page: int = 20,
+    model: str | None = None,
+) -> tuple[list[dict], int]:
+    """Full-text search over assistant replies, best matches first.
+
+    The query uses FTS5 syntax (phrases, AND/OR/NOT, prefix*); if it does not
+    parse it is searched as a literal phrase instead. Snippets mark matched
+    terms with SNIPPET_START/SNIPPET_END.
+
+    Only the newest SEARCH_MATCH_LIMIT matching turns are counted and ranked,
+    so the cost stays bounded however common the query is. A total above
+    SEARCH_MATCH_LIMIT means "more than SEARCH_MATCH_LIMIT". See _rank_matches
+    for why ranking does not use FTS5's bm25().
+
+    Returns a tuple of (results_list, total_count).
+    """
+    if not query.strip():
+        return [], 0
+
+    conn = _get_connection()
+
+    where_sql = "WHERE messages_fts MATCH ?"
+    filter_params = []
+    model_match = ""
+    if model:
+        # The phrase narrows the match through the index; the equality check
+        # drops models whose names merely contain the same tokens
+        model_match = ' AND {model} : "' + model.replace('"', '""') + '"'
+        where_sql += " AND model = ?"
+        filter_params.append(model)
+
+    # One extra row tells whether the total was capped
+    candidates_sql = f"""
+        SELECT rowid, highlight(messages_fts, 0, ?, ?)
+        FROM messages_fts {where_sql}
+        ORDER BY rowid DESC
+        LIMIT {SEARCH_MATCH_LIMIT + 1}
+    """
+    snippet_sql = """
+        SELECT game_id, turn, snippet(messages_fts, 0, ?, ?, '…', 24)
+        FROM messages_fts
+        WHERE messages_fts MATCH ? AND rowid = ?
+    """
+    offset = (page - 1) * per_page
+
+    def run(query: str) -> tuple[int, list[tuple]]:
+        # Only reply text is searched, never the model column
+        match = "{content} : (" + query + ")" + model_match
+        candidates = conn.execute(
+            candidates_sql, [SNIPPET_START, SNIPPET_END, match] + filter_params
+        ).fetchall()
+        ranked = _rank_matches(candidates[:SEARCH_MATCH_LIMIT])
+        rows = [
+            conn.execute(
+                snippet_sql, (SNIPPET_START, SNIPPET_END, match, rowid)
+            ).fetchone()
+            for rowid in ranked[offset : offset + per_page]
+        ]
+        return len(candidates), rows
+
+    try:
+        total_count, rows = run(query)
+    except sqlite3.OperationalError as e:
+        if not str(e).startswith(FTS5_QUERY_ERRORS):
+            raise
+        # Not valid FTS5 syntax (e.g. a stray quote or "<guess>"); search literally
+        total_count, rows = run('"' + query.replace('"', '""') + '"')
+
+    # Game details for just this page
+    game_ids = sorted({row[0] for row in rows})
+    placeholders = ", ".join("?" * len(game_ids))
+    games = {
+        row[0]: row[1:]
+        for row in conn.execute(
+            "SELECT id, model, word, solved, error FROM games "
+            f"WHERE id IN ({placeholders})",
+            game_ids,
+        )
+    }
+
+    results = [
+        {
+            "game_id": game_id,
+            "turn": turn,
+            "model": games[game_id][0],
+            "word": games[game_id][1],
+            "solved": bool(games[game_id][2]),
+            "error": bool(games[game_id][3]),
+            "snippet": snippet,
+        }
+        for game_id, turn, snippet in rows
+        if game_id in games
+    ]
+
+    return results, total_count
+
+
+def _rank_matches(candidates: list[tuple[int, str]]) -> list[int]:
+    """Order (rowid, highlighted content) matches by BM25, best first.
+
+    FTS5's bm25() weighs each query term by how many rows in the whole index
+    contain it, which scans every posting list in full and takes seconds for
+    common terms in a large database. Here term frequency is the number of
+    highlighted spans in the reply and length is measured in characters, so
+    all terms weigh the same. Ties go to the newest turn.
+    """
+    if not candidates:
+        return []
+    avg_length = sum(len(text) for _, text in candidates) / len(candidates)
+    scored = []
+    for rowid, text in candidates:
+        hits = text.count(SNIPPET_START)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(text) / avg_length)
+        scored.append((hits * (BM25_K1 + 1) / (hits + norm), rowid))
+    scored.sort(reverse=True)
+    return [rowid for _, rowid in scored]
+
+
+def create_run(
+    name: str, history_mode: str = "full", execution_mode: str = "interactive"
+) -> int:
+    """Create a new benchmark run and return its ID.
+
+    Every game in the run is played with `history_mode` and `execution_mode`
+    ("interactive", or the batch endpoint kind), so its results stay
+    comparable. Raises ValueError if a run with the same name already exists.
+    """
+    with _db_lock:
+        conn = _get_connection()
+        try:
+            cursor = conn.execute(
+                """
+                INSERT INTO runs (name, history_mode, execution_mode)
+                VALUES (?, ?, ?)
+                """,
+                (name, history_mode, execution_mode),
+            )
+            conn.commit()
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            raise ValueError(f"Run '{name}' already exists")
+        except BaseException:
+            conn.rollback()
+            raise
+    return cursor.lastrowid
+
+
+def _run_from_row(row: tuple) -> dict:
+    """Convert a (id, name, created_at, history_mode, execution_mode) row."""
+    return {
+        "id": row[0],
+        "name": row[1],
+        "created_at": row[2],
+        "history_mode": row[3],
+        "execution_mode": row[4],
+    }
+
+
+def get_run(name: str) -> dict | None:
+    """Retrieve a run by name."""
+    conn = _get_connection()
+    row = conn.execute(
+        """
+        SELECT id, name, created_at, history_mode, execution_mode
+        FROM runs WHERE name = ?
+        """,
+        (name,),
+    ).fetchone()
+    if row is None:
+        return None
+    return _run_from_row(row)
+
+
+def get_latest_run() -> dict | None:
+    """Retrieve the most recently created run."""
+    conn = _get_connection()
+    row = conn.execute(
+        """
+        SELECT id, name, created_at, history_mode, execution_mode
+        FROM runs ORDER BY id DESC LIMIT 1
+        """
+    ).fetchone()
+    if row is None:
+        return None
+    return _run_from_row(row)
+
+
+def list_runs() -> list[dict]:
+    """List all runs, newest first, with their game counts."""
+    conn = _get_connection()
+    cursor = conn.execute("""
+        SELECT
+            r.id,
+            r.name,
+            r.created_at,
+            r.history_mode,
+            r.execution_mode,
+            (SELECT COUNT(*) FROM games g WHERE g.run_id = r.id)
+        FROM runs r
+        ORDER BY r.id DESC
+    """)
+    return [{**_run_from_row(row), "games": row[5]} for row in cursor.fetchall()]
+
+
+def diff_runs(base_run_id: int, new_run_id: int) -> dict:
+    """Compare two runs per model and per (model, word).
+
+    Returns a dict with "models" (success and cost in each run for every model
+    that appears in either) and "words" (games whose outcome changed between
+    the runs, matched on model and word).
+    """
+    conn = _get_connection()
+
+    cursor = conn.execute(
+        """
+        SELECT
+            model,
+            COUNT(CASE WHEN run_id = ?1 THEN 1 END),
+            COUNT(CASE WHEN run_id = ?1 AND solved = TRUE AND guesses < ?3 THEN 1 END),
+            AVG(CASE WHEN run_id = ?1 THEN cost END),
+            COUNT(CASE WHEN run_id = ?2 THEN 1 END),
+            COUNT(CASE WHEN run_id = ?2 AND solved = TRUE AND guesses < ?3 THEN 1 END),
+            AVG(CASE WHEN run_id = ?2 THEN cost END)
+        FROM games
+        WHERE run_id IN (?1, ?2)
+        GROUP BY model
+        ORDER BY model
+        """,
+        (base_run_id, new_run_id, MAX_GUESSES),
+    )
+    models = [
+        {
+            "model": row[0],
+            "base_games": row[1],
+            "base_successful_games": row[2],
+            "base_avg_cost": row[3],
+            "new_games": row[4],
+            "new_successful_games": row[5],
+            "new_avg_cost": row[6],
+        }
+        for row in cursor.fetchall()
+    ]
+
+    cursor = conn.execute(
+        """
+        SELECT a.model, a.word, a.solved, a.guesses, b.solved, b.guesses
+        FROM games a
+        JOIN games b ON b.run_id = ?2 AND b.model = a.model AND b.word = a.word
+        WHERE a.run_id = ?1 AND (a.solved != b.solved OR a.guesses != b.guesses)
+        ORDER BY a.model, a.word
+        """,
+        (base_run_id, new_run_id),
+    )
+    words = [
+        {
+            "model": row[0],
+            "word": row[1],
+            "base_solved": bool(row[2]),
+            "base_guesses": row[3],
+            "new_solved": bool(row[4]),
+            "new_guesses": row[5],
+        }
+        for row in cursor.fetchall()
+    ]
+
     return {"models": models, "words": words}
@@ -23,9 +23,15 @@ def generate_table_row(data, rank):
     provider = model_parts[0] if len(model_parts) > 1 else "unknown"
     model_name = model_parts[1] if len(model_parts) > 1 else data["model"]
 
-    success_rate = data["successful_games"]
+    # Older results.json files only have the count out of 100 games
+    success_rate = data.get("success_rate", data["successful_games"])
+    interval = ""
+    if "success_rate_ci_low" in data:
+        interval = f"""<small class="text-muted ms-1" title="95% interval">({data["success_rate_ci_low"]:.0f}-{data["success_rate_ci_high"]:.0f}%)</small>"""
     avg_guesses = data["guesses_per_game_avg"]
+    # Batch-only models have no recorded cost
     avg_cost = data["avg_cost_per_game"]
+    avg_cost = "-" if avg_cost is None else f"${avg_cost:.2f}"
 
     rank_class = get_rank_class(rank)
 
@@ -38,11 +44,11 @@ def generate_table_row(data, rank):
                                     <div class="progress flex-grow-1" style="height: 8px; max-width: 100px;">
                                         <div class="progress-bar progress-bar-custom" role="progressbar" style="width: {success_rate}%"></div>
                                     </div>
-                                    <span class="ms-2">{success_rate}%</span>
+                                    <span class="ms-2">{success_rate:g}%</span>{interval}
                                 </div>
                             </td>
                             <td>{avg_guesses}</td>
-                            <td>${avg_cost:.2f}</td>
+                            <td>{avg_cost}</td>
                         </tr>"""
 
 
@@ -50,8 +56,12 @@ def generate_table_body(results):
     """Generate the full table body from results data."""
     rows = []
 
-    # Sort by successful_games descending
-    sorted_results = sorted(results, key=lambda x: x["successful_games"], reverse=True)
+    # Sort by success rate descending
+    sorted_results = sorted(
+        results,
+        key=lambda x: x.get("success_rate", x["successful_games"]),
+        reverse=True,
+    )
 
     for i, result in enumerate(sorted_results):
         rank = i + 1  # Simple sequential ranking
@@ -68,11 +78,16 @@ def generate_failed_words_table(failed_words):
         rank = i + 1
         word = word_data.get("word", "")
 
+        # Calibrated difficulty from irt.json, when available
+        difficulty = ""
+        if word_data.get("difficulty") is not None:
+            difficulty = f"""<small class="text-muted ms-1" title="IRT difficulty ± standard error">({word_data["difficulty"]:.2f} ± {word_data["difficulty_se"]:.2f})</small>"""
+
         rank_class = get_rank_class(rank)
 
         row = f"""                                <tr>
                                     <td><span class="badge-rank {rank_class}">{rank}</span></td>
-                                    <td><span class="model-name">{word}</span></td>
+                                    <td><span class="model-name">{word}</span>{difficulty}</td>
                                 </tr>"""
         rows.append(row)
 
@@ -137,10 +152,15 @@ def main():
     with open(results_path, "r") as f:
         results = json.load(f)
 
-    # Read failed_words.json
-    failed_words_path = Path("failed_words.json")
-    with open(failed_words_path, "r") as f:
-        failed_words = json.load(f)
+    # Hardest words by calibrated IRT difficulty, falling back to raw failure counts
+    irt_path = Path("irt.json")
+    if irt_path.exists():
+        with open(irt_path, "r") as f:
+            failed_words = json.load(f)["words"][:10]
+    else:
+        failed_words_path = Path("failed_words.json")
+        with open(failed_words_path, "r") as f:
+            failed_words = json.load(f)
 
     # Read top_error_models.json
     error_models_path = Path("top_error_models.json")
@@ -0,0 +1,223 @@
+"""Models x words outcome matrices and item-response (Rasch / 2PL) fitting.
+
+P(model m solves word w) = sigmoid(a_w * (ability_m - difficulty_w)), with
+a_w fixed at 1 for the Rasch model. Parameters are fitted jointly by
+penalized maximum likelihood: weak normal priors keep abilities and
+difficulties finite for models or words with perfect records. Every update is
+a vectorized Newton step over the whole matrix.
+"""
+
+import sqlite3
+import warnings
+
+import numpy as np
+
+from wordle import MAX_GUESSES
+
+
+def load_outcome_matrix(conn: sqlite3.Connection, run_id: int) -> dict:
+    """Load a run into dense models x words matrices.
+
+    Returns a dict with "models" and "words" (sorted labels) and float
+    matrices "solved", "guesses" and "cost", which are NaN where a model did
+    not play a word. If a pair was played more than once, the last game wins.
+    """
+    rows = conn.execute(
+        "SELECT model, word, solved, guesses, cost FROM games WHERE run_id = ? ORDER BY id",
+        (run_id,),
+    ).fetchall()
+
+    if not rows:
+        empty = np.full((0, 0), np.nan)
+        return {
+            "models": [],
+            "words": [],
+            "solved": empty,
+            "guesses": empty.copy(),
+            "cost": empty.copy(),
+        }
+
+    model_col, word_col, solved_col, guesses_col, cost_col = zip(*rows)
+    models, model_idx = np.unique(np.array(model_col), return_inverse=True)
+    words, word_idx = np.unique(np.array(word_col), return_inverse=True)
+    solved_arr = np.array(solved_col, dtype=bool)
+    guesses_arr = np.array(guesses_col, dtype=float)
+
+    shape = (len(models), len(words))
+    solved = np.full(shape, np.nan)
+    guesses = np.full(shape, np.nan)
+    cost = np.full(shape, np.nan)
+    solved[model_idx, word_idx] = solved_arr & (guesses_arr < MAX_GUESSES)
+    guesses[model_idx, word_idx] = guesses_arr
+    cost[model_idx, word_idx] = np.array(cost_col, dtype=float)
+
+    return {
+        "models": models.tolist(),
+        "words": words.tolist(),
+        "solved": solved,
+        "guesses": guesses,
+        "cost": cost,
+    }
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+def fit_irt(
+    solved: np.ndarray,
+    model: str = "rasch",
+    prior_sd: float = 3.0,
+    discrimination_prior_sd: float = 0.5,
+    max_iter: int = 500,
+    tol: float = 1e-4,
+) -> dict:
+    """Fit a Rasch or 2PL model to a models x words matrix of 0/1/NaN outcomes.
+
+    Returns a dict of arrays: "ability" and "ability_se" per model,
+    "difficulty", "difficulty_se" and "discrimination" per word, plus
+    "iterations" and "converged".
+    """
+    if model not in ("rasch", "2pl"):
+        raise ValueError(f"Unknown IRT model '{model}'")
+
+    observed = ~np.isnan(solved)
+    y = np.where(observed, solved, 0.0)
+    mask = observed.astype(float)
+    n_models, n_words = solved.shape
+
+    # Start from the logits of the raw (smoothed) solve rates
+    model_rate = (y.sum(axis=1) + 0.5) / (mask.sum(axis=1) + 1.0)
+    word_rate = (y.sum(axis=0) + 0.5) / (mask.sum(axis=0) + 1.0)
+    theta = np.log(model_rate / (1.0 - model_rate))
+    b = -np.log(word_rate / (1.0 - word_rate))
+    log_a = np.zeros(n_words)
+
+    prior_precision = 1.0 / prior_sd**2
+    alpha_precision = 1.0 / discrimination_prior_sd**2
+
+    converged = False
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        a = np.exp(log_a)
+
+        # Abilities
+        p = _sigmoid(a * (theta[:, None] - b))
+        residual = mask * (y - p)
+        weight = mask * p * (1.0 - p)
+        grad = residual @ a - prior_precision * theta
+        info = weight @ (a * a) + prior_precision
+        step_theta = np.clip(grad / info, -1.0, 1.0)
+        theta += step_theta
+
+        # Difficulties
+        p = _sigmoid(a * (theta[:, None] - b))
+        residual = mask * (y - p)
+        weight = mask * p * (1.0 - p)
+        grad = -a * residual.sum(axis=0) - prior_precision * b
+        info = a * a * weight.sum(axis=0) + prior_precision
+        step_b = np.clip(grad / info, -1.0, 1.0)
+        b += step_b
+
+        # The likelihood is unchanged by shifting abilities and difficulties
+        # together; jump straight to the shift the priors prefer, since block
+        # Newton steps only crawl along that flat direction.
+        if n_models + n_words:
+            shift = -(theta.sum() + b.sum()) / (n_models + n_words)
+            theta += shift
+            b += shift
+
+        max_step = max(
+            np.abs(step_theta).max(initial=0.0), np.abs(step_b).max(initial=0.0)
+        )
+
+        # Discriminations (2PL only), parameterized on the log scale
+        if model == "2pl":
+            z_unit = theta[:, None] - b
+            p = _sigmoid(a * z_unit)
+            residual = mask * (y - p)
+            weight = mask * p * (1.0 - p)
+            z = a * z_unit
+            grad = (residual * z).sum(axis=0) - alpha_precision * log_a
+            info = (weight * z * z).sum(axis=0) + alpha_precision
+            step_a = np.clip(grad / info, -0.5, 0.5)
+            log_a += step_a
+            max_step = max(max_step, np.abs(step_a).max(initial=0.0))
+
+        if max_step < tol:
+            converged = True
+            break
+
+    # Standard errors from the diagonal of the penalized information
+    a = np.exp(log_a)
+    p = _sigmoid(a * (theta[:, None] - b))
+    weight = mask * p * (1.0 - p)
+    ability_se = 1.0 / np.sqrt(weight @ (a * a) + prior_precision)
+    difficulty_se = 1.0 / np.sqrt(a * a * weight.sum(axis=0) + prior_precision)
+
+    return {
+        "ability": theta,
+        "ability_se": ability_se,
+        "difficulty": b,
+        "difficulty_se": difficulty_se,
+        "discrimination": a,
+        "iterations": iteration,
+        "converged": converged,
+    }
+
+
+def summarize_fit(outcomes: dict, fit: dict, model: str) -> dict:
+    """Combine matrix summaries and fitted parameters into a JSON-ready dict."""
+    solved = outcomes["solved"]
+    guesses = outcomes["guesses"]
+    cost = outcomes["cost"]
+    observed = ~np.isnan(solved)
+
+    # Words nobody solved (or models with no games) have empty means -> NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        model_games = observed.sum(axis=1)
+        model_solve_rate = np.nanmean(solved, axis=1)
+        model_avg_cost = np.nanmean(cost, axis=1)
+        word_games = observed.sum(axis=0)
+        word_solve_rate = np.nanmean(solved, axis=0)
+        solved_guesses = np.where(solved == 1.0, guesses, np.nan)
+        word_avg_guesses = np.nanmean(solved_guesses, axis=0)
+
+    def number(value, digits=3):
+        return None if np.isnan(value) else round(float(value), digits)
+
+    models = [
+        {
+            "model": name,
+            "ability": number(fit["ability"][i]),
+            "ability_se": number(fit["ability_se"][i]),
+            "games": int(model_games[i]),
+            "solve_rate": number(model_solve_rate[i]),
+            "avg_cost": number(model_avg_cost[i], 4),
+        }
+        for i, name in enumerate(outcomes["models"])
+    ]
+    words = [
+        {
+            "word": name,
+            "difficulty": number(fit["difficulty"][j]),
+            "difficulty_se": number(fit["difficulty_se"][j]),
+            "discrimination": number(fit["discrimination"][j]),
+            "games": int(word_games[j]),
+            "solve_rate": number(word_solve_rate[j]),
+            "avg_guesses_when_solved": number(word_avg_guesses[j], 2),
+        }
+        for j, name in enumerate(outcomes["words"])
+    ]
+
+    models.sort(key=lambda m: m["ability"], reverse=True)
+    words.sort(key=lambda w: w["difficulty"], reverse=True)
+
+    return {
+        "irt_model": model,
+        "iterations": fit["iterations"],
+        "converged": fit["converged"],
+        "models": models,
+        "words": words,
+    }
@@ -1,48 +1,62 @@
+import argparse
 import os
 import random
-import re
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
-from db import add_game, check_game, init_db
+from batch import LocalBatchEndpoint, OpenAIBatchEndpoint, run_batch, solver_responder
+from confidence import AdaptiveScheduler
+from db import (
+    add_game,
+    check_game,
+    create_run,
+    diff_runs,
+    get_latest_run,
+    get_model_outcomes,
+    get_run,
+    init_db,
+    list_runs,
+)
 from models import Game
+from transport import ConnectionStats, build_http_client
+from wordle import build_request_messages, new_game, record_reply
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize OpenAI client - API key loaded from .env file (OPENAI_API_KEY)
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1", api_key=os.getenv("OPENAI_API_KEY")
-)
-
-system_prompt = open("prompts/system_prompt.md").read()
-user_prompt = open("prompts/user_prompt.md").read()
-
-
-def extract_tag(data: str, tag: str) -> str:
-    pattern = f"<{tag}>(.*?)</{tag}>"
-    match = re.search(pattern, data, re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    return ""
-
-
-def evaluate_guess(guess: str, target: str) -> str:
-    guess = guess.upper()
-    target = target.upper()
-    result = []
-    for g_char, t_char in zip(guess, target):
-        if g_char == t_char:
-            result.append("G")  # Green
-        elif g_char in target:
-            result.append("Y")  # Yellow
-        else:
-            result.append("B")  # Black
-    return "".join(result)
+# Shared API client, built by configure_client() once concurrency is known
+client: OpenAI | None = None
+http_stats = ConnectionStats()
+
+
+def configure_client(
+    max_connections: int,
+    http2: bool = True,
+    connect_timeout: float = 10.0,
+    read_timeout: float = 900.0,
+) -> None:
+    """Build the shared client on a connection pool sized for `max_connections` workers."""
+    global client
+    http_client = build_http_client(
+        max_connections,
+        http2=http2,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        stats=http_stats,
+    )
+    # API key loaded from .env file (OPENAI_API_KEY)
+    client = OpenAI(
+        base_url="https://openrouter.ai/api/v1",
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=http_client,
+        timeout=http_client.timeout,
+    )
 
 
 def get_random_words(num: int = 1) -> list[str]:
@@ -57,7 +71,7 @@ def get_words() -> list[str]:
         return words
 
 
-def make_guess(messages: list[dict], model: str, word: str):
+def make_guess(messages: list[dict], model: str, word: str, run_name: str):
     while True:
         try:
             resp = client.chat.completions.create(
@@ -65,7 +79,7 @@ def make_guess(messages: list[dict], model: str, word: str):
                 messages=messages,
                 extra_body={
                     "reasoning": {"effort": "high"},
-                    "trace": {"benchmark": True, "word": word, "run": "2026-03-18"},
+                    "trace": {"benchmark": True, "word": word, "run": run_name},
                 },
             )
             break
@@ -82,68 +96,370 @@ def make_guess(messages: list[dict], model: str, word: str):
     return resp
 
 
-def play_wordle(word: str, model: str) -> Game:
+def play_wordle(word: str, model: str, run: dict, history_mode: str = "full") -> Game:
     print(f"({model} {word}) Starting Wordle game")
 
-    max_guesses = 6
-
-    game = Game(model=model, word=word)
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt},
-    ]
+    game = new_game(word, model, run, history_mode)
+    history: list[tuple[str, str]] = []
 
-    while game.guesses <= max_guesses:
-        guess_completion = make_guess(messages, model, word)
-        guess_content = guess_completion.choices[0].message.content
+    while True:
+        request_messages = build_request_messages(game, history)
+        guess_completion = make_guess(request_messages, model, word, run["name"])
         game.cost += guess_completion.usage.cost
-        messages.append({"role": "assistant", "content": guess_content})
-
-        try:
-            guess = extract_tag(guess_content, "guess").upper()
-        except Exception as e:
-            print(f"Error extracting guess for model {model} and word {word}: {e}")
-            print(guess_content)
-            print(guess_completion)
-            guess = ""
-
-        if guess == "":
-            print(f"({model} {word}) LLM failed to provide a guess. Ending game.")
-            game.error = True
-            game.guesses = -1
-            game.messages = messages
+        if record_reply(game, history, guess_completion.choices[0].message.content):
             return game
 
-        result = evaluate_guess(guess, word)
-
-        print(f"({model} {word}) Guess ({game.guesses}): {guess}")
-        print(f"({model} {word}) Result: {result}")
-
-        if guess == word:
-            print(f"({model} {word}) Solved in {game.guesses} guesses!")
-            game.solved = True
-            break
-
-        if game.guesses < max_guesses:
-            game.guesses += 1
-            messages.append({"role": "user", "content": f"Result: {result}"})
-        else:
-            break
-
-    game.messages = messages
-
-    if not game.solved:
-        print(f"({model} {word}) Failed to solve the wordle")
-        game.guesses = max_guesses
-        game.solved = False
 
-    return game
+def run_task(
+    word: str,
+    model: str,
+    run: dict,
+    scheduler: AdaptiveScheduler | None,
+    history_mode: str,
+) -> Game | None:
+    """Play a game unless adaptive mode has already stopped the model."""
+    if scheduler is not None and scheduler.is_stopped(model):
+        return None
+    return play_wordle(word, model, run, history_mode)
+
+
+def pending_tasks(
+    models: list[str],
+    words: list[str],
+    run_id: int,
+    scheduler: AdaptiveScheduler | None,
+) -> Iterator[tuple[str, str]]:
+    """Lazily yield (word, model) pairs that still need to be played in a run.
+
+    games.db is checked at dispatch time, so stopped models and games finished
+    earlier in the sweep are skipped without materializing the full task list.
+    """
+    if scheduler is None:
+        pairs = ((word, model) for model in models for word in words)
+    else:
+        # Interleave models so every model's interval tightens at the same pace
+        pairs = ((word, model) for word in words for model in models)
+
+    for word, model in pairs:
+        if scheduler is not None and scheduler.is_stopped(model):
+            continue
+        if check_game(model, word, run_id):
+            continue
+        yield word, model
+
+
+def handle_result(
+    future: Future, word: str, model: str, scheduler: AdaptiveScheduler | None
+) -> bool:
+    """Persist a finished game and return True if one was played."""
+    try:
+        game = future.result()
+        if game is None:
+            return False
+        add_game(game)
+        if scheduler is not None:
+            print_stopped(scheduler, scheduler.record(game))
+        return True
+    except Exception as exc:
+        print(
+            f"Task for word '{word}' with model '{model}' generated an exception: {exc}"
+        )
+        traceback.print_exc()
+        return False
+
+
+def run_sweep(
+    tasks: Iterable[tuple[str, str]],
+    run: dict,
+    scheduler: AdaptiveScheduler | None,
+    max_workers: int,
+    max_in_flight: int,
+    history_mode: str = "full",
+) -> int:
+    """Play tasks with at most `max_in_flight` games submitted at once.
+
+    Tasks are pulled from the iterable only when a slot frees up, and each
+    finished game is persisted and released immediately, so memory stays flat
+    regardless of the sweep size. Returns the number of games played.
+    """
+    played = 0
+    task_iter = iter(tasks)
+    in_flight: dict[Future, tuple[str, str]] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Top up the window; this is where backpressure is applied
+            while len(in_flight) < max_in_flight:
+                task = next(task_iter, None)
+                if task is None:
+                    break
+                word, model = task
+                future = executor.submit(
+                    run_task, word, model, run, scheduler, history_mode
+                )
+                in_flight[future] = task
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                word, model = in_flight.pop(future)
+                played += handle_result(future, word, model, scheduler)
+
+    return played
+
+
+def print_stopped(scheduler: AdaptiveScheduler, stopped: list[str]) -> None:
+    for model in stopped:
+        low, high = scheduler.interval(model)
+        print(
+            f"({model}) Adaptive stop: success rate {low:.0%}-{high:.0%} "
+            "is settled, skipping remaining words"
+        )
+
+
+def make_batch_endpoint(kind: str, args: argparse.Namespace):
+    """Build the batch endpoint selected with --batch."""
+    if kind == "local":
+        # Offline stand-in: answers instantly with a feedback-consistent guess
+        with open("words_full.txt", "r") as file:
+            words = [line.strip() for line in file if line.strip()]
+        return LocalBatchEndpoint(solver_responder(words), polls_until_complete=0)
+
+    # Comma-separated models the batch API serves, e.g. "openai/gpt-5,openai/gpt-5-mini"
+    supported = {
+        m.strip() for m in os.getenv("OPENAI_BATCH_MODELS", "").split(",") if m.strip()
+    }
+    if not supported:
+        raise SystemExit(
+            "--batch openai needs OPENAI_BATCH_MODELS listing the models it serves"
+        )
+
+    # API key loaded from .env file (OPENAI_BATCH_API_KEY); defaults to api.openai.com
+    http_client = build_http_client(
+        1,
+        http2=not args.no_http2,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        stats=http_stats,
+    )
+    batch_client = OpenAI(
+        base_url=os.getenv("OPENAI_BATCH_BASE_URL"),
+        api_key=os.getenv("OPENAI_BATCH_API_KEY"),
+        http_client=http_client,
+        timeout=http_client.timeout,
+    )
+    return OpenAIBatchEndpoint(batch_client, supported)
+
+
+def resolve_run(args: argparse.Namespace) -> dict:
+    """Start, resume or default to the run selected on the command line.
+
+    A run keeps the history and execution modes it was started with; resuming
+    it with a different --history or --batch is refused so its games stay
+    comparable.
+    """
+    history_mode = args.history or "full"
+    execution_mode = args.batch or "interactive"
+
+    if args.new_run:
+        try:
+            create_run(args.new_run, history_mode, execution_mode)
+        except ValueError as e:
+            raise SystemExit(f"{e}; use --run to resume it")
+        print(f"Started run '{args.new_run}'")
+        return get_run(args.new_run)
+
+    if args.run:
+        run = get_run(args.run)
+        if run is None:
+            raise SystemExit(
+                f"Run '{args.run}' does not exist; use --new-run to start it"
+            )
+    else:
+        run = get_latest_run()
+        if run is None:
+            name = date.today().isoformat()
+            create_run(name, history_mode, execution_mode)
+            print(f"Started run '{name}'")
+            return get_run(name)
+
+    if args.history and args.history != run["history_mode"]:
+        raise SystemExit(
+            f"Run '{run['name']}' uses --history {run['history_mode']}; "
+            "start a new run to use a different history mode"
+        )
+    if execution_mode != run["execution_mode"]:
+        flag = (
+            "no --batch"
+            if run["execution_mode"] == "interactive"
+            else f"--batch {run['execution_mode']}"
+        )
+        raise SystemExit(
+            f"Run '{run['name']}' was played with {flag}; "
+            "start a new run to use a different execution mode"
+        )
+    return run
+
+
+def print_runs() -> None:
+    for run in list_runs():
+        print(
+            f"{run['name']}\t{run['games']} games\t{run['history_mode']} history\t"
+            f"{run['execution_mode']}\tcreated {run['created_at']}"
+        )
+
+
+def print_run_diff(base_name: str, new_name: str) -> None:
+    base = get_run(base_name)
+    new = get_run(new_name)
+    for name, run in ((base_name, base), (new_name, new)):
+        if run is None:
+            raise SystemExit(f"Run '{name}' does not exist")
+
+    diff = diff_runs(base["id"], new["id"])
+
+    print(f"Per-model changes ({base_name} -> {new_name}):")
+    for row in diff["models"]:
+        base_rate = (
+            f"{row['base_successful_games']}/{row['base_games']}"
+            if row["base_games"]
+            else "-"
+        )
+        new_rate = (
+            f"{row['new_successful_games']}/{row['new_games']}"
+            if row["new_games"]
+            else "-"
+        )
+        print(f"  {row['model']}: {base_rate} -> {new_rate}")
+
+    print(f"Per-word changes ({len(diff['words'])}):")
+    for row in diff["words"]:
+        base_result = (
+            f"{'solved' if row['base_solved'] else 'failed'} in {row['base_guesses']}"
+        )
+        new_result = (
+            f"{'solved' if row['new_solved'] else 'failed'} in {row['new_guesses']}"
+        )
+        print(f"  {row['model']} {row['word']}: {base_result} -> {new_result}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the WordleBench sweep.")
+    runs = parser.add_mutually_exclusive_group()
+    runs.add_argument("--new-run", metavar="NAME", help="Start a new named run")
+    runs.add_argument(
+        "--run", metavar="NAME", help="Resume an existing run (default: latest run)"
+    )
+    runs.add_argument("--list-runs", action="store_true", help="List runs and exit")
+    runs.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "NEW"),
+        help="Show per-model and per-word changes between two runs and exit",
+    )
+    parser.add_argument(
+        "--history",
+        choices=["full", "compact"],
+        default=None,
+        help="Resend the full transcript each turn, or only a compact guess history "
+        "(fixed when a run starts; default: full, or the resumed run's mode)",
+    )
+    parser.add_argument(
+        "--batch",
+        choices=["openai", "local"],
+        default=None,
+        help="Play each model's games in lockstep through a batch endpoint "
+        "instead of interactive calls ('local' is an offline stand-in)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between batch status checks",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=25,
+        help="Number of games played concurrently",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Maximum games submitted but not yet persisted (default: 2x workers)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds to wait when opening a connection to the API",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=900.0,
+        help="Seconds to wait for response data before a call is retried or fails",
+    )
+    parser.add_argument(
+        "--no-http2",
+        action="store_true",
+        help="Use HTTP/1.1 connections instead of multiplexed HTTP/2",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Stop dispatching a model's words once its success-rate interval is settled",
+    )
+    parser.add_argument(
+        "--level",
+        type=float,
+        default=0.95,
+        help="Credible level of the adaptive success-rate intervals",
+    )
+    parser.add_argument(
+        "--precision",
+        type=float,
+        default=0.1,
+        help="Stop a model once its interval is at most this wide",
+    )
+    parser.add_argument(
+        "--min-games",
+        type=int,
+        default=20,
+        help="Minimum games per model before adaptive stopping applies",
+    )
+    args = parser.parse_args()
+    if args.adaptive and args.batch:
+        # Every game of a batch sweep starts in the first wave, so there is
+        # nothing left for adaptive stopping to skip
+        parser.error("--adaptive cannot be combined with --batch")
+    if args.max_in_flight is None:
+        args.max_in_flight = 2 * args.workers
+    args.max_in_flight = max(args.max_in_flight, args.workers)
+    return args
 
 
 # main execution
 if __name__ == "__main__":
+    args = parse_args()
     init_db()
 
+    if args.list_runs:
+        print_runs()
+        raise SystemExit(0)
+    if args.compare:
+        print_run_diff(*args.compare)
+        raise SystemExit(0)
+
+    run = resolve_run(args)
+    print(
+        f"Playing run '{run['name']}' with {run['history_mode']} history "
+        f"({run['execution_mode']})"
+    )
+
     words = get_words()
     models = [
         "openai/gpt-5.6-sol",
@@ -233,32 +549,42 @@ if __name__ == "__main__":
         "thinkingmachines/inkling-small",
     ]
 
-    # Create all (word, model) pairs to process, filtering out existing games
-    tasks = [
-        (word, model)
-        for model in models
-        for word in words
-        if not check_game(model, word)
-    ]
-
-    print(f"Found {len(tasks)} new games to play (filtered out existing games)")
-
-    # Run play_wordle calls in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=25) as executor:
-        # Submit all tasks
-        future_to_task = {
-            executor.submit(play_wordle, word, model): (word, model)
-            for word, model in tasks
+    scheduler = None
+    if args.adaptive:
+        scheduler = AdaptiveScheduler(
+            models,
+            level=args.level,
+            precision=args.precision,
+            min_games=args.min_games,
+        )
+        print_stopped(scheduler, scheduler.seed(get_model_outcomes(run["id"])))
+
+    if args.batch:
+        endpoint = make_batch_endpoint(args.batch, args)
+        unsupported = [model for model in models if not endpoint.supports(model)]
+        if unsupported:
+            print(
+                f"Skipping {len(unsupported)} models the batch endpoint does not serve"
+            )
+        words_by_model = {
+            model: [word for word in words if not check_game(model, word, run["id"])]
+            for model in models
+            if endpoint.supports(model)
         }
-
-        # Collect results as they complete
-        for future in as_completed(future_to_task):
-            word, model = future_to_task[future]
-            try:
-                game = future.result()
-                add_game(game)
-            except Exception as exc:
-                print(
-                    f"Task for word '{word}' with model '{model}' generated an exception: {exc}"
-                )
-                traceback.print_exc()
+        played = run_batch(
+            words_by_model, run, endpoint, run["history_mode"], args.poll_interval
+        )
+    else:
+        configure_client(
+            args.workers,
+            http2=not args.no_http2,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout,
+        )
+        tasks = pending_tasks(models, words, run["id"], scheduler)
+        played = run_sweep(
+            tasks, run, scheduler, args.workers, args.max_in_flight, run["history_mode"]
+        )
+
+    print(f"Played {played} new games (skipped existing games)")
+    print(http_stats.summary())
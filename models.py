@@ -8,4 +8,7 @@ class Game(BaseModel):
     solved: bool = False
     error: bool = False
     messages: list[dict] = []
-    cost: float = 0.0
+    # None when the provider reports no cost (e.g. batch output)
+    cost: float | None = 0.0
+    run_id: int | None = None
+    history_mode: str = "full"
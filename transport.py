@@ -0,0 +1,88 @@
+"""Pooled HTTP transport for the API clients, with connection reuse statistics."""
+
+import threading
+
+import httpx
+
+
+class ConnectionStats:
+    """Count requests and newly opened connections across all worker threads.
+
+    Requests are tagged with an httpcore trace callback, so a TCP connect is
+    only counted when the pool could not reuse an existing connection.
+    """
+
+    def __init__(self, log_every: int = 100):
+        self.log_every = log_every
+        self.requests = 0
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def on_request(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self._trace
+        with self._lock:
+            self.requests += 1
+            should_log = self.log_every and self.requests % self.log_every == 0
+        if should_log:
+            print(self.summary())
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.new_connections += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            requests = self.requests
+            new_connections = self.new_connections
+        reused = max(requests - new_connections, 0)
+        return {
+            "requests": requests,
+            "new_connections": new_connections,
+            "reused": reused,
+            "reuse_rate": reused / requests if requests else 0.0,
+        }
+
+    def summary(self) -> str:
+        stats = self.snapshot()
+        return (
+            f"HTTP pool: {stats['requests']} requests over "
+            f"{stats['new_connections']} new connections "
+            f"({stats['reuse_rate']:.1%} reused)"
+        )
+
+
+def build_http_client(
+    max_connections: int,
+    http2: bool = True,
+    connect_timeout: float = 10.0,
+    read_timeout: float = 900.0,
+    write_timeout: float = 30.0,
+    pool_timeout: float = 60.0,
+    keepalive_expiry: float = 120.0,
+    stats: ConnectionStats | None = None,
+) -> httpx.Client:
+    """Build an httpx client whose pool is sized to the caller's concurrency.
+
+    The read timeout is long enough for high-effort reasoning calls but still
+    finite, so a stalled response raises instead of hanging a worker forever.
+    HTTP/2 lets requests to the same host share multiplexed connections.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        connect=connect_timeout,
+        read=read_timeout,
+        write=write_timeout,
+        pool=pool_timeout,
+    )
+    event_hooks = {"request": [stats.on_request]} if stats is not None else {}
+    return httpx.Client(
+        http2=http2,
+        limits=limits,
+        timeout=timeout,
+        event_hooks=event_hooks,
+    )
@@ -3,9 +3,19 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from flask import Flask, render_template, request, send_from_directory
-
-from db import get_filter_options, get_game, init_db, list_games
+from flask import Flask, jsonify, render_template, request, send_from_directory
+from markupsafe import Markup, escape
+
+from db import (
+    SEARCH_MATCH_LIMIT,
+    SNIPPET_END,
+    SNIPPET_START,
+    get_filter_options,
+    get_game,
+    init_db,
+    list_games,
+    search_messages,
+)
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
@@ -20,6 +30,7 @@ def index():
     sort_order = request.args.get("sort_order", "asc")
 
     # Filter parameters
+    run = request.args.get("run", type=int)
     model = request.args.get("model") or None
     word = request.args.get("word") or None
     solved = request.args.get("solved")
@@ -45,6 +56,7 @@ def index():
         word=word,
         solved=solved,
         error=error,
+        run_id=run,
     )
 
     # Get filter options
@@ -69,8 +81,73 @@ def index():
         word=word,
         solved=solved,
         error=error,
+        run=run,
         models=filter_options["models"],
         words=filter_options["words"],
+        runs=filter_options["runs"],
+    )
+
+
+def highlight(snippet: str) -> Markup:
+    """Escape a search snippet and wrap matched terms in <mark> tags."""
+    return Markup(
+        str(escape(snippet))
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_END, "</mark>")
+    )
+
+
+@app.route("/search")
+def search():
+    query = request.args.get("q", "")
+    page = max(request.args.get("page", 1, type=int), 1)
+    model = request.args.get("model") or None
+
+    results, total_count = search_messages(query, page=page, per_page=20, model=model)
+    for result in results:
+        result["snippet"] = highlight(result["snippet"])
+
+    # Counts stop at SEARCH_MATCH_LIMIT, and only that many matches are ranked
+    capped = total_count > SEARCH_MATCH_LIMIT
+    total_count = min(total_count, SEARCH_MATCH_LIMIT)
+    total_pages = (total_count + 19) // 20
+
+    return render_template(
+        "search.html",
+        q=query,
+        results=results,
+        page=page,
+        total_pages=total_pages,
+        total_count=f"{total_count}+" if capped else total_count,
+        has_prev=page > 1,
+        has_next=page < total_pages,
+        model=model,
+        models=get_filter_options()["models"],
+    )
+
+
+@app.route("/api/search")
+def api_search():
+    query = request.args.get("q", "")
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = max(1, min(request.args.get("per_page", 20, type=int), 100))
+    model = request.args.get("model") or None
+
+    results, total_count = search_messages(
+        query, page=page, per_page=per_page, model=model
+    )
+    for result in results:
+        result["snippet"] = str(highlight(result["snippet"]))
+
+    return jsonify(
+        {
+            "query": query,
+            "page": page,
+            "per_page": per_page,
+            "total_count": min(total_count, SEARCH_MATCH_LIMIT),
+            "total_capped": total_count > SEARCH_MATCH_LIMIT,
+            "results": results,
+        }
     )
 
 
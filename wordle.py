@@ -0,0 +1,118 @@
+"""Wordle rules and per-turn game bookkeeping shared by both runners."""
+
+import re
+from pathlib import Path
+
+from models import Game
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+# A game ends after this many guesses; leaderboard successes need fewer.
+MAX_GUESSES = 6
+
+system_prompt = (PROMPTS_DIR / "system_prompt.md").read_text()
+user_prompt = (PROMPTS_DIR / "user_prompt.md").read_text()
+
+
+def extract_tag(data: str, tag: str) -> str:
+    pattern = f"<{tag}>(.*?)</{tag}>"
+    match = re.search(pattern, data, re.DOTALL)
+    if match:
+        return match.group(1).strip()
+    return ""
+
+
+def evaluate_guess(guess: str, target: str) -> str:
+    guess = guess.upper()
+    target = target.upper()
+    result = []
+    for g_char, t_char in zip(guess, target):
+        if g_char == t_char:
+            result.append("G")  # Green
+        elif g_char in target:
+            result.append("Y")  # Yellow
+        else:
+            result.append("B")  # Black
+    return "".join(result)
+
+
+def format_compact_history(history: list[tuple[str, str]]) -> str:
+    """Render the guess/feedback history as a single compact user message."""
+    lines = ["Guess history (G=green, Y=yellow, B=gray/black):"]
+    for i, (guess, result) in enumerate(history, start=1):
+        lines.append(f"{i}. {guess} -> {result}")
+    lines.append("Make your next guess.")
+    return "\n".join(lines)
+
+
+def build_request_messages(game: Game, history: list[tuple[str, str]]) -> list[dict]:
+    """Return the messages to send for the game's next turn.
+
+    "full" resends the whole transcript. "compact" sends only the system prompt
+    and the structured guess history, so per-turn input stays roughly constant.
+    """
+    if game.history_mode == "full" or not history:
+        return game.messages
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": format_compact_history(history)},
+    ]
+
+
+def new_game(word: str, model: str, run: dict, history_mode: str = "full") -> Game:
+    """Create a game whose transcript starts with the system and user prompts."""
+    return Game(
+        model=model,
+        word=word,
+        run_id=run["id"],
+        history_mode=history_mode,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+    )
+
+
+def record_reply(
+    game: Game, history: list[tuple[str, str]], content: str | None
+) -> bool:
+    """Apply one assistant reply to the game and return True once it is over.
+
+    The full transcript is kept on game.messages for the viewer; `history`
+    collects (guess, result) pairs for compact prompting.
+    """
+    model, word = game.model, game.word
+    game.messages.append({"role": "assistant", "content": content})
+
+    try:
+        guess = extract_tag(content, "guess").upper()
+    except Exception as e:
+        print(f"Error extracting guess for model {model} and word {word}: {e}")
+        print(content)
+        guess = ""
+
+    if guess == "":
+        print(f"({model} {word}) LLM failed to provide a guess. Ending game.")
+        game.error = True
+        game.guesses = -1
+        return True
+
+    result = evaluate_guess(guess, word)
+
+    print(f"({model} {word}) Guess ({game.guesses}): {guess}")
+    print(f"({model} {word}) Result: {result}")
+
+    if guess == word:
+        print(f"({model} {word}) Solved in {game.guesses} guesses!")
+        game.solved = True
+        return True
+
+    if game.guesses < MAX_GUESSES:
+        game.guesses += 1
+        game.messages.append({"role": "user", "content": f"Result: {result}"})
+        history.append((guess, result))
+        return False
+
+    print(f"({model} {word}) Failed to solve the wordle")
+    game.guesses = MAX_GUESSES
+    game.solved = False
+    return True